@@ -3,69 +3,214 @@ import re
 import sys
 import os
 import csv
+import itertools
+import multiprocessing
+import pickle
+import shutil
+import tempfile
 from collections import Counter
-import numpy as np
-from scipy.stats import chi2_contingency
+from concurrent.futures import ProcessPoolExecutor
 
-def analyze_posts(file_prefix, results, baseline_ratio=None):
+# scipy is only needed for the chi-square p-value; import it once here and let
+# the rest of the analysis run without it if it isn't installed
+try:
+    from scipy.stats import chi2 as chi2_distribution
+except ImportError:
+    chi2_distribution = None
+
+# ijson streams posts out of the file one at a time instead of loading the whole
+# list into memory; fall back to the standard json module if it isn't installed
+try:
+    import ijson
+    _JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _JSON_ERRORS = (json.JSONDecodeError,)
+
+# When posts can't be streamed, simdjson parses the whole file far faster than
+# the json module. One parser is reused for every file so its buffers are only
+# allocated once.
+try:
+    import simdjson
+    _SIMDJSON_PARSER = simdjson.Parser()
+except ImportError:
+    simdjson = None
+
+# orjson is the next fastest whole-file parser; its JSONDecodeError subclasses the
+# json module's, so malformed files are still reported the same way
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Number of most common words reported for each subreddit
+TOP_WORDS = 50
+
+# Directory where per-file word counts are cached between runs
+CACHE_DIR = ".cache"
+
+# Bump this whenever the way count_words builds its counts changes (the fields it
+# reads, lowercasing, etc.) so that older cache entries are ignored
+CACHE_VERSION = 1
+
+# Tokenizer pattern, compiled once at import rather than looked up on every call
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Comprehensive lexicon of 100 anxiety-related words
+# This lexicon was manually curated to capture various aspects of anxiety:
+# - Emotional states (anxiety, fear, panic)
+# - Physical symptoms (trembling, sweating, nausea)
+# - Treatments (therapy, medication, meditation)
+# - Medical terminology (ssri, diagnosis, psychiatrist)
+# - Coping mechanisms (breathing, grounding, mindfulness)
+# Stored as a frozenset so membership checks are hash lookups, not list scans
+ANXIETY_WORDS = frozenset([
+    "anxiety", "panic", "stress", "fear", "worry", "nervous", "anxious", "overwhelmed", 
+    "dread", "scared", "terror", "phobia", "obsession", "compulsion", "trembling", 
+    "shaking", "insomnia", "nausea", "sweating", "breathless", "hyperventilating", 
+    "palpitations", "therapy", "medication", "psychiatrist", "psychologist", "counseling", 
+    "depression", "trauma", "disorder", "attack", "agoraphobia", "claustrophobia", 
+    "social", "ocd", "ptsd", "gad", "overthinking", "catastrophizing", "avoidance", 
+    "reassurance", "rumination", "trigger", "coping", "mindfulness", "meditation", 
+    "breathing", "xanax", "zoloft", "prozac", "lexapro", "ssri", "benzodiazepine", 
+    "klonopin", "valium", "ativan", "buspar", "antidepressant", "symptoms", "diagnosis", 
+    "recovery", "relapse", "chest", "tight", "dizzy", "lightheaded", "ibs", "stomach", 
+    "tension", "muscle", "headache", "fatigue", "exhaustion", "tired", "irritable", 
+    "health", "doctor", "hospital", "er", "emergency", "medicine", "pharmacist", 
+    "prescription", "dose", "side-effects", "withdrawal", "dependence", "addiction", 
+    "tolerance", "cbt", "exposure", "relaxation", "grounding", "techniques", "self-care", 
+    "support", "group", "helpline", "crisis", "mental", "brain", "heart", "racing", "sleep"
+])
+
+def iter_posts(filename):
+    """
+    Yield each post dictionary from a JSON file of Reddit posts.
+    
+    When ijson is available the posts are parsed incrementally, so memory use
+    stays bounded by the size of a single post rather than the whole file.
+    Otherwise the file is loaded in one go, using simdjson or orjson if installed.
+    
+    Parameters:
+    - filename: Path to a JSON file containing a list of posts
+    """
+    if ijson is not None:
+        with open(filename, 'rb') as f:
+            # ijson.items would quietly yield nothing for a document that isn't a list,
+            # so check the first parse event and reject it like the other parsers do
+            events = ijson.parse(f)
+            first_event = next(events, None)
+            if first_event != ('', 'start_array', None):
+                raise json.JSONDecodeError("Expected a JSON array of posts", "", 0)
+            yield from ijson.items(itertools.chain([first_event], events), 'item')
+    elif simdjson is not None:
+        # simdjson reports malformed JSON as a plain ValueError; re-raise it as the
+        # json module's error so it isn't confused with other ValueErrors
+        try:
+            posts = _SIMDJSON_PARSER.load(filename)
+        except ValueError as e:
+            raise json.JSONDecodeError(str(e), "", 0) from e
+        yield from posts
+    elif orjson is not None:
+        with open(filename, 'rb') as f:
+            yield from orjson.loads(f.read())
+    else:
+        with open(filename, 'r') as f:
+            yield from json.load(f)
+
+def count_words(filename):
+    """
+    Tokenize every post in a JSON file of Reddit posts and count the words.
+    
+    The counts are cached in CACHE_DIR, keyed on the file's modification time and
+    size and on CACHE_VERSION, so re-running the analysis doesn't re-tokenize files
+    that haven't changed.
+    Only the word counts are cached, so edits to the anxiety lexicon or a new
+    baseline never produce stale results.
+    
+    Parameters:
+    - filename: Path to a JSON file containing a list of posts
+    
+    Returns:
+    - Tuple of (total number of words, Counter of word frequencies)
+    """
+    stat = os.stat(filename)
+    cache_key = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size, _WORD_RE.pattern)
+    cache_file = os.path.join(CACHE_DIR, os.path.splitext(os.path.basename(filename))[0] + ".pkl")
+    
+    # Reuse the cached counts if the file hasn't changed since they were saved
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_key, cached_counts = pickle.load(f)
+        if cached_key == cache_key:
+            return cached_counts
+    except Exception:
+        pass  # No usable cache entry (missing, corrupt or an unexpected format), so count from scratch
+    
+    # Tokenize the text of each post into individual words:
+    # - Convert to lowercase to treat "Anxiety" and "anxiety" as the same word
+    # - Remove punctuation and keep only word characters
+    # - \b ensures we capture whole words only (not partial matches)
+    # Each field of each post is tokenized on its own and counted straight away,
+    # so neither a corpus-sized string nor a corpus-sized word list is ever built
+    word_counts = Counter()
+    for post in iter_posts(filename):  # Read the Reddit posts from the JSON file
+        # Post title, post content and all comments combined; empty fields are skipped
+        for field in ("title", "body", "all_comment_text"):
+            text = post.get(field, "")
+            if text:
+                word_counts.update(_WORD_RE.findall(text.lower()))
+    
+    counts = (sum(word_counts.values()), word_counts)
+    
+    # Caching is best-effort: a failed write only means recounting next time
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump((cache_key, counts), f)
+    except OSError:
+        pass
+    
+    return counts
+
+def analyze_posts(file_prefix, baseline_ratio=None):
     """
     Analyze a JSON file of Reddit posts to extract and analyze anxiety-related word usage.
     
     Parameters:
     - file_prefix: The prefix for the JSON filename (e.g., 'anxiety' for 'anxiety_posts.json')
-    - results: A dictionary to store the analysis results
     - baseline_ratio: The expected ratio of anxiety words (from AskReddit or default)
     
     Returns:
-    - True if analysis was successful, False otherwise
+    - Dictionary of analysis results for this subreddit, or None if the analysis failed
     """
     # Construct the complete filename from the provided prefix
     filename = f"{file_prefix}_posts.json"
     
     try:
-        # Read the JSON file containing Reddit posts
-        with open(filename, 'r') as f:
-            data = json.load(f)
-        
-        # Combine all text from post title, body and comments into a single string
-        # This creates a corpus of text for the entire subreddit
-        all_text = ""
-        for post in data:
-            title = post.get("title", "")  # Post title
-            body = post.get("body", "")    # Post content
-            all_comment_text = post.get("all_comment_text", "")  # All comments combined
-            
-            # Concatenate with spaces to create one large text corpus
-            all_text += " " + title + " " + body + " " + all_comment_text
-        
-        # Tokenize the text into individual words:
-        # - Convert to lowercase to treat "Anxiety" and "anxiety" as the same word
-        # - Remove punctuation and keep only word characters
-        # - \b ensures we capture whole words only (not partial matches)
-        words = re.findall(r'\b\w+\b', all_text.lower())
+        # Tokenize and count every word in the corpus (or reuse the cached counts)
+        total_words, word_counts = count_words(filename)
         
-        # Count the frequency of each word in the corpus
-        word_counts = Counter(words)
-        
-        # Create a sorted list of word frequencies, filtering out words that appear only once
+        # Create a sorted list of the most frequent words, filtering out words that appear only once
         # This helps focus on more meaningful patterns rather than one-off mentions
-        sorted_words = [(word, count) for word, count in word_counts.most_common() if count > 1]
+        # Only the top TOP_WORDS are reported, so let most_common pick them with a heap
+        # instead of sorting every word; filtering afterwards avoids copying the whole vocabulary
+        sorted_words = [(word, count) for word, count in word_counts.most_common(TOP_WORDS) if count > 1]
         
         # Run specialized analysis to detect anxiety-related words in the corpus
-        anxiety_stats = analyze_anxiety_words(words)
+        anxiety_stats = analyze_anxiety_words(word_counts, total_words)
         
         # Calculate the ratio of anxiety words to total words (convert percentage to decimal)
         current_ratio = anxiety_stats['percentage_of_all_words'] / 100
         
-        # Add all analysis results to the results dictionary for this subreddit
-        results[file_prefix] = {
-            'total_words': len(words),                        # Total word count in the corpus
+        # Collect all analysis results for this subreddit
+        file_results = {
+            'total_words': total_words,                       # Total word count in the corpus
             'unique_words': len(word_counts),                 # Number of unique words
             'anxiety_word_count': anxiety_stats['total_anxiety_words'],  # Count of anxiety words
             'unique_anxiety_words': anxiety_stats['unique_anxiety_words'],  # Count of unique anxiety words
             'anxiety_word_percentage': anxiety_stats['percentage_of_all_words'],  # % of words that are anxiety-related
             'anxiety_word_coverage': anxiety_stats['percentage_of_anxiety_list_found'],  # % of anxiety lexicon found
-            'word_frequency': sorted_words,                   # List of all words and their frequencies
+            'word_frequency': sorted_words,                   # List of the most common words and their frequencies
             'anxiety_word_frequency': anxiety_stats['anxiety_counts'],  # List of anxiety words and frequencies
             'anxiety_word_ratio': current_ratio               # Ratio of anxiety words to total words
         }
@@ -74,77 +219,47 @@ def analyze_posts(file_prefix, results, baseline_ratio=None):
         if baseline_ratio is not None:
             # Chi-square test determines if the observed frequency of anxiety words
             # differs significantly from what would be expected based on the baseline
-            chi_square_results = chi_square_test(words, anxiety_stats, expected_ratio=baseline_ratio)
-            results[file_prefix].update(chi_square_results)  # Add statistical results to our data
-            results[file_prefix]['baseline_source'] = 'askreddit' if baseline_ratio else 'default'
+            chi_square_results = chi_square_test(total_words, anxiety_stats, expected_ratio=baseline_ratio)
+            file_results.update(chi_square_results)  # Add statistical results to our data
+            file_results['baseline_source'] = 'askreddit' if baseline_ratio else 'default'
         
         print(f"Analyzed {filename} successfully")
-        return True
+        return file_results
             
     except FileNotFoundError:
         # Handle case where the JSON file doesn't exist
         print(f"Error: File '{filename}' not found.")
-        return False
-    except json.JSONDecodeError:
+        return None
+    except _JSON_ERRORS:
         # Handle case where the file exists but isn't valid JSON
         print(f"Error: '{filename}' is not a valid JSON file.")
-        return False
+        return None
     except Exception as e:
         # Catch any other unexpected errors
         print(f"An error occurred with {filename}: {e}")
-        return False
+        return None
 
-def analyze_anxiety_words(words):
+def analyze_anxiety_words(word_counts, total_words):
     """
-    Identify and count anxiety-related words in a list of words.
+    Identify and count anxiety-related words in a corpus.
     
     Parameters:
-    - words: A list of all words in the corpus
+    - word_counts: Counter of every word in the corpus
+    - total_words: Total number of words in the corpus
     
     Returns:
     - Dictionary containing various anxiety word statistics
     """
-    # Comprehensive list of 100 anxiety-related words
-    # This lexicon was manually curated to capture various aspects of anxiety:
-    # - Emotional states (anxiety, fear, panic)
-    # - Physical symptoms (trembling, sweating, nausea)
-    # - Treatments (therapy, medication, meditation)
-    # - Medical terminology (ssri, diagnosis, psychiatrist)
-    # - Coping mechanisms (breathing, grounding, mindfulness)
-    anxiety_words = [
-        "anxiety", "panic", "stress", "fear", "worry", "nervous", "anxious", "overwhelmed", 
-        "dread", "scared", "terror", "phobia", "obsession", "compulsion", "trembling", 
-        "shaking", "insomnia", "nausea", "sweating", "breathless", "hyperventilating", 
-        "palpitations", "therapy", "medication", "psychiatrist", "psychologist", "counseling", 
-        "depression", "trauma", "disorder", "attack", "agoraphobia", "claustrophobia", 
-        "social", "ocd", "ptsd", "gad", "overthinking", "catastrophizing", "avoidance", 
-        "reassurance", "rumination", "trigger", "coping", "mindfulness", "meditation", 
-        "breathing", "xanax", "zoloft", "prozac", "lexapro", "ssri", "benzodiazepine", 
-        "klonopin", "valium", "ativan", "buspar", "antidepressant", "symptoms", "diagnosis", 
-        "recovery", "relapse", "chest", "tight", "dizzy", "lightheaded", "ibs", "stomach", 
-        "tension", "muscle", "headache", "fatigue", "exhaustion", "tired", "irritable", 
-        "health", "doctor", "hospital", "er", "emergency", "medicine", "pharmacist", 
-        "prescription", "dose", "side-effects", "withdrawal", "dependence", "addiction", 
-        "tolerance", "cbt", "exposure", "relaxation", "grounding", "techniques", "self-care", 
-        "support", "group", "helpline", "crisis", "mental", "brain", "heart", "racing", "sleep"
-    ]
-    
-    # Initialize counters for tracking anxiety word frequency
-    anxiety_counts = Counter()      # Will track each anxiety word and its frequency
-    total_anxiety_words = 0         # Running total of all anxiety word occurrences
-    total_words = len(words)        # Total number of words in the corpus
-    
-    # Scan through all words in the corpus
-    for word in words:
-        # Check if the current word is in our anxiety lexicon
-        if word in anxiety_words:
-            anxiety_counts[word] += 1  # Increment the count for this specific anxiety word
-            total_anxiety_words += 1   # Increment the total anxiety word counter
+    # Pick the lexicon words out of the corpus vocabulary rather than re-scanning every
+    # token. The vocabulary is walked in insertion order, so equally-frequent words keep
+    # the order in which they first appear in the corpus.
+    anxiety_counts = Counter({word: count for word, count in word_counts.items() if word in ANXIETY_WORDS})
+    total_anxiety_words = sum(anxiety_counts.values())  # All anxiety word occurrences
     
     # Return a comprehensive dictionary of anxiety word statistics
     return {
         # List of anxiety words found, sorted by frequency (most common first)
-        'anxiety_counts': sorted(anxiety_counts.items(), key=lambda x: x[1], reverse=True),
+        'anxiety_counts': anxiety_counts.most_common(),
         
         # Total number of anxiety words found (including duplicates)
         'total_anxiety_words': total_anxiety_words,
@@ -156,10 +271,10 @@ def analyze_anxiety_words(words):
         'percentage_of_all_words': (total_anxiety_words/total_words)*100 if total_words > 0 else 0,
         
         # Percentage of our anxiety lexicon that appears in the corpus (coverage)
-        'percentage_of_anxiety_list_found': (len(anxiety_counts)/len(anxiety_words))*100 if anxiety_words else 0
+        'percentage_of_anxiety_list_found': (len(anxiety_counts)/len(ANXIETY_WORDS))*100 if ANXIETY_WORDS else 0
     }
 
-def chi_square_test(words, anxiety_stats, expected_ratio=0.005):
+def chi_square_test(total_words, anxiety_stats, expected_ratio=0.005):
     """
     Perform chi-square test to determine if anxiety words appear
     more frequently than expected by random chance.
@@ -168,7 +283,7 @@ def chi_square_test(words, anxiety_stats, expected_ratio=0.005):
     to determine if the difference is statistically significant or likely due to chance.
     
     Parameters:
-    - words: list of all words in the corpus
+    - total_words: total number of words in the corpus
     - anxiety_stats: dictionary of anxiety word statistics
     - expected_ratio: expected frequency of anxiety words in general text
       (default 0.5% if not provided, but typically uses AskReddit baseline)
@@ -176,30 +291,39 @@ def chi_square_test(words, anxiety_stats, expected_ratio=0.005):
     Returns:
     - Dictionary with chi-square statistics and interpretation
     """
+    # Get total counts
+    anxiety_count = anxiety_stats['total_anxiety_words']
+    non_anxiety_count = total_words - anxiety_count
+    
+    if chi2_distribution is None:
+        # Handle case where scipy is not installed
+        print("Warning: scipy not installed. Chi-square test skipped.")
+        return {
+            'chi2_statistic': None,
+            'chi2_p_value': None,
+            'chi2_significant': None,
+            'expected_anxiety_ratio': expected_ratio,
+            'expected_anxiety_count': total_words * expected_ratio,
+            'observed_to_expected_ratio': None
+        }
+    
     try:
-        from scipy.stats import chi2_contingency
-        
-        # Get total counts
-        total_words = len(words)
-        anxiety_count = anxiety_stats['total_anxiety_words']
-        non_anxiety_count = total_words - anxiety_count
-        
-        # Create observed contingency table [anxiety words, non-anxiety words]
-        # This represents the actual distribution in our corpus
-        observed = np.array([anxiety_count, non_anxiety_count])
-        
         # Expected values based on expected_ratio (from baseline)
         # This represents what we would expect if the null hypothesis were true
         # (that anxiety words appear at the same rate as in the baseline)
-        expected = np.array([
-            total_words * expected_ratio,            # Expected anxiety words
-            total_words * (1 - expected_ratio)       # Expected non-anxiety words
-        ])
+        expected_anxiety = total_words * expected_ratio                # Expected anxiety words
+        expected_non_anxiety = total_words * (1 - expected_ratio)      # Expected non-anxiety words
         
-        # Perform chi-square test (we use [observed] and [expected] to create 2x1 tables)
-        # This calculates whether the difference between observed and expected
-        # is statistically significant
-        chi2, p, dof, _ = chi2_contingency([observed, expected])
+        # Chi-square test on the 2x2 table [observed, expected], worked out directly
+        # rather than through scipy's general chi2_contingency. Both rows sum to
+        # total_words, so each column total is split evenly between them and every
+        # cell differs from its expected count by the same amount. As chi2_contingency
+        # does for 1 degree of freedom, Yates' continuity correction is applied.
+        anxiety_column = (anxiety_count + expected_anxiety) / 2
+        non_anxiety_column = (non_anxiety_count + expected_non_anxiety) / 2
+        deviation = max(abs(anxiety_count - expected_anxiety) / 2 - 0.5, 0)
+        chi2 = 2 * deviation**2 * (1 / anxiety_column + 1 / non_anxiety_column)
+        p = chi2_distribution.sf(chi2, 1)
         
         # Return comprehensive results dictionary
         return {
@@ -217,23 +341,12 @@ def chi_square_test(words, anxiety_stats, expected_ratio=0.005):
             'expected_anxiety_ratio': expected_ratio,
             
             # How many anxiety words we would expect based on the baseline
-            'expected_anxiety_count': expected[0],
+            'expected_anxiety_count': expected_anxiety,
             
             # Ratio comparing actual vs expected (effect size)
             # Values above 1.0 indicate more anxiety words than expected
             # Values below 1.0 indicate fewer anxiety words than expected
-            'observed_to_expected_ratio': anxiety_count / expected[0] if expected[0] > 0 else float('inf')
-        }
-    except ImportError:
-        # Handle case where scipy is not installed
-        print("Warning: scipy not installed. Chi-square test skipped.")
-        return {
-            'chi2_statistic': None,
-            'chi2_p_value': None,
-            'chi2_significant': None,
-            'expected_anxiety_ratio': expected_ratio,
-            'expected_anxiety_count': total_words * expected_ratio,
-            'observed_to_expected_ratio': None
+            'observed_to_expected_ratio': anxiety_count / expected_anxiety if expected_anxiety > 0 else float('inf')
         }
     except Exception as e:
         # Handle any other errors in the statistical calculation
@@ -247,29 +360,84 @@ def chi_square_test(words, anxiety_stats, expected_ratio=0.005):
             'observed_to_expected_ratio': None
         }
 
-def write_to_csv(results, baseline_source, output_filename="anxiety_analysis_results.csv"):
+def format_optional(value, spec):
+    """
+    Format a statistic for the CSV, or return 'N/A' if it wasn't calculated.
+    
+    Parameters:
+    - value: The value to format (None if unavailable)
+    - spec: Format specification, e.g. '.2f'
+    """
+    return format(value, spec) if value is not None else 'N/A'
+
+def write_word_frequencies(writer, prefix, data):
+    """
+    Write the detailed word frequency tables for one subreddit.
+    
+    Parameters:
+    - writer: csv.writer to write the rows to
+    - prefix: The subreddit's file prefix
+    - data: Analysis results for the subreddit, as returned by analyze_posts
+    """
+    # Rows are handed to the csv module in batches with writerows, and the (word, count)
+    # pairs are written as they are rather than being copied into lists row by row
+    
+    # Section header for general word frequencies
+    writer.writerows([[f"Word frequencies for {prefix}_posts.json:"], ['Word', 'Count']])
+    
+    # Write the most common words
+    writer.writerows(data['word_frequency'])
+    
+    # Add space before anxiety-specific word frequencies, then the anxiety section header
+    writer.writerows([[], [f"Anxiety-related word frequencies for {prefix}_posts.json:"], ['Word', 'Count']])
+    
+    # Write all detected anxiety words and their counts
+    writer.writerows(data['anxiety_word_frequency'])
+        
+    writer.writerow([])  # Add space between subreddits
+
+def record_results(results, prefix, file_results, details_writer):
+    """
+    Store a subreddit's summary figures and stream out its word frequency tables.
+    
+    The frequency lists are written straight away and then dropped, so only the
+    small summary figures are held in memory until the CSV is written.
+    
+    Parameters:
+    - results: Dictionary of summary results for each subreddit
+    - prefix: The subreddit's file prefix
+    - file_results: Analysis results for the subreddit, as returned by analyze_posts
+    - details_writer: csv.writer for the detailed word frequency section
+    """
+    write_word_frequencies(details_writer, prefix, file_results)
+    del file_results['word_frequency'], file_results['anxiety_word_frequency']
+    results[prefix] = file_results
+
+def write_to_csv(results, baseline_source, details_file, output_filename="anxiety_analysis_results.csv"):
     """
     Write analysis results to a CSV file.
     
     Parameters:
-    - results: Dictionary containing analysis results for each subreddit
+    - results: Dictionary containing summary results for each subreddit
     - baseline_source: String describing the source of the baseline ratio
+    - details_file: Temporary file holding the word frequency tables written by record_results
     - output_filename: Name of the CSV file to write
     """
     # Create new CSV file (or overwrite existing)
     with open(output_filename, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
         
-        # Write the header row with column names
+        # Build the header and summary rows first and write them with a single writerows call
+        # Start with the header row with column names
         # This defines the structure of our results table
-        writer.writerow(['File Prefix', 'Total Words', 'Unique Words', 'Anxiety Words Count', 
-                        'Unique Anxiety Words', 'Anxiety Word %', 'Anxiety List Coverage %',
-                        'Chi2 Statistic', 'Chi2 P-Value', 'Statistically Significant', 
-                        'Expected Anxiety Count', 'Observed/Expected Ratio', 'Baseline Source'])
+        rows = [['File Prefix', 'Total Words', 'Unique Words', 'Anxiety Words Count', 
+                 'Unique Anxiety Words', 'Anxiety Word %', 'Anxiety List Coverage %',
+                 'Chi2 Statistic', 'Chi2 P-Value', 'Statistically Significant', 
+                 'Expected Anxiety Count', 'Observed/Expected Ratio', 'Baseline Source']]
         
-        # Write each subreddit's summary data as a row
+        # Add each subreddit's summary data as a row
         for prefix, data in results.items():
-            writer.writerow([
+            rows.append([
                 prefix,                                  # Subreddit name
                 data['total_words'],                     # Total word count
                 data['unique_words'],                    # Unique word count
@@ -279,51 +447,31 @@ def write_to_csv(results, baseline_source, output_filename="anxiety_analysis_res
                 f"{data['anxiety_word_coverage']:.2f}%",    # Percentage of anxiety lexicon found
                 
                 # Format chi-square statistic (measure of deviation from expected)
-                f"{data.get('chi2_statistic', 'N/A'):.4f}" if data.get('chi2_statistic') is not None else 'N/A',
+                format_optional(data.get('chi2_statistic'), '.4f'),
                 
                 # Format p-value (probability of observed result under null hypothesis)
-                f"{data.get('chi2_p_value', 'N/A'):.6f}" if data.get('chi2_p_value') is not None else 'N/A',
+                format_optional(data.get('chi2_p_value'), '.6f'),
                 
                 # Simple Yes/No for statistical significance at p < 0.05
                 "Yes" if data.get('chi2_significant') else "No",
                 
                 # Expected number of anxiety words based on baseline
-                f"{data.get('expected_anxiety_count', 'N/A'):.2f}" if data.get('expected_anxiety_count') is not None else 'N/A',
+                format_optional(data.get('expected_anxiety_count'), '.2f'),
                 
                 # Ratio of observed/expected (effect size measure)
-                f"{data.get('observed_to_expected_ratio', 'N/A'):.2f}" if data.get('observed_to_expected_ratio') is not None else 'N/A',
+                format_optional(data.get('observed_to_expected_ratio'), '.2f'),
                 
                 # Source of the baseline (AskReddit or default)
                 baseline_source
             ])
         
         # Add separator before detailed word frequency analysis
-        writer.writerow([])
-        writer.writerow(["Detailed Word Frequency Analysis"])
-        writer.writerow([])
+        rows.extend([[], ["Detailed Word Frequency Analysis"], []])
+        writer.writerows(rows)
         
-        # For each analyzed subreddit, include detailed word frequency data
-        for prefix, data in results.items():
-            # Section header for general word frequencies
-            writer.writerow([f"Word frequencies for {prefix}_posts.json:"])
-            writer.writerow(['Word', 'Count'])
-            
-            # Write the top 50 most common words
-            for word, count in data['word_frequency'][:50]:
-                writer.writerow([word, count])
-                
-            # Add space before anxiety-specific word frequencies
-            writer.writerow([])
-            
-            # Section header for anxiety word frequencies
-            writer.writerow([f"Anxiety-related word frequencies for {prefix}_posts.json:"])
-            writer.writerow(['Word', 'Count'])
-            
-            # Write all detected anxiety words and their counts
-            for word, count in data['anxiety_word_frequency']:
-                writer.writerow([word, count])
-                
-            writer.writerow([])  # Add space between subreddits
+        # Append the word frequency tables that were streamed out during the analysis
+        details_file.seek(0)
+        shutil.copyfileobj(details_file, csvfile)
     
     print(f"Results written to {output_filename}")
 
@@ -331,7 +479,7 @@ def main():
     """
     Main function that orchestrates the entire analysis process:
     1. Processes AskReddit data first (if available) to establish baseline
-    2. Analyzes all other subreddit data files
+    2. Analyzes all other subreddit data files in parallel across CPU cores
     3. Writes results to CSV
     """
     # Dictionary to store all analysis results
@@ -343,17 +491,24 @@ def main():
     baseline_source = "default (0.5%)"
     
     # Process AskReddit first if available to establish baseline anxiety word ratio
+    askreddit_results = None
     if os.path.exists(askreddit_file):
         print("Processing AskReddit first to establish baseline ratio...")
-        analyze_posts('askreddit', results)
+        askreddit_results = analyze_posts('askreddit')
+    
+    if askreddit_results is not None:
+        results['askreddit'] = askreddit_results
         
         # Extract the anxiety word ratio from AskReddit results to use as baseline
-        baseline_ratio = results['askreddit']['anxiety_word_ratio']
+        baseline_ratio = askreddit_results['anxiety_word_ratio']
         baseline_source = f"askreddit ({baseline_ratio*100:.3f}%)"
         print(f"Using AskReddit baseline ratio: {baseline_ratio*100:.3f}%")
     else:
-        # If AskReddit data isn't available, use a default value
-        print("AskReddit data not found, using default ratio of 0.5%")
+        # If AskReddit data isn't available or couldn't be analyzed, use a default value
+        if os.path.exists(askreddit_file):
+            print("AskReddit data could not be analyzed, using default ratio of 0.5%")
+        else:
+            print("AskReddit data not found, using default ratio of 0.5%")
         baseline_ratio = 0.005  # Default fallback (0.5%)
     
     # Find all JSON files matching the pattern '*_posts.json'
@@ -365,16 +520,42 @@ def main():
         print("No JSON files matching '*_posts.json' pattern found in the current directory.")
         return
     
-    # Process each JSON file, comparing against the established baseline
-    for json_file in json_files:
-        # Extract the subreddit name from the filename
-        prefix = json_file.replace('_posts.json', '')
+    # Detailed word frequency tables are streamed to a temporary file as each
+    # subreddit's results come in, so only the summary figures stay in memory
+    with tempfile.TemporaryFile('w+', newline='', encoding='utf-8') as details_file:
+        details_writer = csv.writer(details_file)
         
-        # Analyze this subreddit's posts, using the baseline for statistical comparison
-        analyze_posts(prefix, results, baseline_ratio)
-    
-    # Write all results to CSV file
-    write_to_csv(results, baseline_source)
+        # AskReddit's tables come first, matching its row in the summary
+        if 'askreddit' in results:
+            record_results(results, 'askreddit', results['askreddit'], details_writer)
+        
+        # Fork the workers where that's safe, so they inherit the regex, lexicon and
+        # JSON parser already built at import instead of importing this module again.
+        # macOS and Windows keep their default start method (spawn).
+        mp_context = None
+        if sys.platform != 'darwin' and 'fork' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('fork')
+        
+        # Process each JSON file, comparing against the established baseline.
+        # Files are independent of one another, so each is analyzed in its own process.
+        with ProcessPoolExecutor(mp_context=mp_context) as executor:
+            futures = {}
+            for json_file in json_files:
+                # Extract the subreddit name from the filename
+                prefix = json_file.replace('_posts.json', '')
+                
+                # Analyze this subreddit's posts, using the baseline for statistical comparison
+                futures[prefix] = executor.submit(analyze_posts, prefix, baseline_ratio)
+            
+            # Collect results in file order (not completion order) so the CSV layout
+            # is the same whichever worker finishes first
+            for prefix, future in futures.items():
+                file_results = future.result()
+                if file_results is not None:
+                    record_results(results, prefix, file_results, details_writer)
+        
+        # Write all results to CSV file
+        write_to_csv(results, baseline_source, details_file)
 
 # Entry point: Run main() when script is executed directly
 if __name__ == "__main__":
@@ -1,8 +1,17 @@
-# Standard library imports for file operations, timing, and system functions
+# Standard library imports for file operations, concurrency, time handling, and system functions
 import json
 import os
+import shelve
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson reads and writes JSON several times faster than the json module;
+# fall back to json if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Set up paths to ensure we can import the YARS package regardless of where the script is executed from
 current_dir = os.path.dirname(os.path.abspath(__file__))  # Get the directory containing this script
@@ -17,10 +26,12 @@ from YARS.src.yars.utils import display_results, download_image
 
 def extract_all_comment_text(comments):
     """
-    Recursively extract text from all comments and their replies.
+    Extract text from all comments and their replies.
     
     This function traverses through the nested comment structure that Reddit uses,
     where comments can have replies, and those replies can have further replies.
+    It walks the tree with an explicit stack rather than recursion, so deep threads
+    can't hit Python's recursion limit and each comment's text is joined only once.
     
     Parameters:
     - comments: A list of comment dictionaries, potentially containing nested replies
@@ -30,37 +41,52 @@ def extract_all_comment_text(comments):
     """
     all_text = []  # Initialize empty list to collect comment texts
     
-    for comment in comments:
-        if isinstance(comment, dict):  # Ensure we're working with a valid comment dict
+    # Comments still to visit, with the next one at the end. Lists are pushed in
+    # reverse so comments come out in thread order: each comment, then its replies,
+    # then its next sibling.
+    stack = list(reversed(comments))
+    
+    while stack:
+        comment = stack.pop()
+        # Comments are almost always dicts, so just use .get and skip anything
+        # without it rather than type-checking every comment
+        try:
             # Extract the comment's main text content
             body = comment.get('body', '')
             if body:
                 all_text.append(body)  # Add this comment's text to our collection
             
-            # Recursively process any replies to this comment
+            # Visit any replies to this comment before moving on to its siblings
             replies = comment.get('replies', [])
-            if replies:
-                # Recursively extract text from nested replies and add to our collection
-                all_text.append(extract_all_comment_text(replies))
+        except AttributeError:  # Not a valid comment dict
+            continue
+        if replies:
+            stack.extend(reversed(replies))
     
     # Join all collected comment texts with double newlines to separate distinct comments
-    # Filter out any None or empty strings first
-    return "\n\n".join(filter(None, all_text))
+    return "\n\n".join(all_text)
 
-def scrape_subreddit(subreddit_name, limit=100, save_interval=10):
+def scrape_subreddit(subreddit_name, limit=100, save_interval=10, max_workers=8, keep_comment_tree=False,
+                     request_interval=0.5):
     """
     Scrape posts and comments from a specified subreddit and save them to a JSON file.
     
     This function performs the main data collection workflow:
     1. Creates or loads an existing JSON file for the subreddit
     2. Fetches posts from the subreddit
-    3. Processes each post to extract details and comments
+    3. Fetches the details and comments of several posts concurrently, reusing
+       any details cached by an earlier run
     4. Saves data periodically to prevent data loss
     
     Parameters:
     - subreddit_name: Name of the subreddit to scrape (without the 'r/' prefix)
     - limit: Maximum number of posts to fetch (default 100)
     - save_interval: How often to save progress (default every 10 posts)
+    - max_workers: Number of posts whose details are fetched at once (default 8)
+    - keep_comment_tree: Also save each post's nested comment structure alongside
+      the flattened comment text (default False, which roughly halves the file size)
+    - request_interval: Minimum number of seconds between starting two fetches, so
+      the concurrent fetches don't flood Reddit with requests (default 0.5)
     """
     # Initialize the scraper
     miner = YARS()
@@ -75,11 +101,10 @@ def scrape_subreddit(subreddit_name, limit=100, save_interval=10):
     if os.path.exists(filename):
         try:
             # Try to load existing data file
-            with open(filename, 'r', encoding='utf-8') as f:
-                posts_data = json.load(f)
-                # Create a set of permalinks we've already processed
-                processed_permalinks = {post.get('permalink', '') for post in posts_data}
-                print(f"Resuming from existing file with {len(posts_data)} posts already processed.")
+            posts_data = load_from_file(filename)
+            # Create a set of permalinks we've already processed
+            processed_permalinks = {post.get('permalink', '') for post in posts_data}
+            print(f"Resuming from existing file with {len(posts_data)} posts already processed.")
         except Exception as e:
             # Handle any errors when loading the file
             print(f"Error loading existing file: {e}")
@@ -96,68 +121,146 @@ def scrape_subreddit(subreddit_name, limit=100, save_interval=10):
     )
     
     # --- Process Each Post ---
+    # Work out which posts still need fetching, skipping posts we've already
+    # processed (when resuming) and any post listed more than once
+    pending_posts = {}
     for i, post in enumerate(subreddit_posts, 1):
         permalink = post.get("permalink", "")  # Unique identifier for the post
-        
-        # Skip posts we've already processed (when resuming)
-        if permalink in processed_permalinks:
+        if permalink in processed_permalinks or permalink in pending_posts:
             print(f"Skipping already processed post {i}/{len(subreddit_posts)}...")
             continue
+        pending_posts[permalink] = post
+    
+    # Raw post details are cached on disk by permalink, so re-running the scrape
+    # (e.g. after changing how comments are extracted) reads them back instead of
+    # fetching every post from Reddit again. The cache is only touched from this
+    # thread, as shelve isn't safe to share between threads.
+    # Fetching post details is almost entirely waiting on Reddit, so posts missing
+    # from the cache are fetched several at once. Results are handled in listing
+    # order, so the saved file keeps the same post order as a one-at-a-time run.
+    with shelve.open(f"{subreddit_name}_details.cache") as details_cache, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Fetches are started in a sliding window of at most max_workers, rather than
+        # all being queued up front, so an interrupted run only waits for the few
+        # requests already in flight
+        fetches = {}  # Permalink -> future for each post whose details are being fetched
+        upcoming = iter(pending_posts)  # Posts not yet checked for fetching, in listing order
+        last_request = 0.0  # When the most recent fetch was started
         
-        try:
-            print(f"Processing post {i}/{len(subreddit_posts)}...")
-            # Fetch detailed information about the post, including all comments
-            post_details = miner.scrape_post_details(permalink)
-            
-            # --- Extract Relevant Post Information ---
-            post_data = {
-                "title": post.get("title", ""),  # Post title
-                "body": post_details.get("body", ""),  # Post content/description
-                "score": post.get("score", 0),  # Upvote score
-                "url": post.get("url", ""),  # External URL (if any)
-                "created_utc": post.get("created_utc", ""),  # Post creation timestamp
-                "author": post.get("author", ""),  # Username of poster
-                "permalink": permalink,  # Reddit permalink (for tracking and referencing)
-                "comments": post_details.get("comments", []),  # Full comment data structure
-                "all_comment_text": extract_all_comment_text(post_details.get("comments", []))  # All comments as one string
-            }
-            
-            # Add this post to our collection and mark it as processed
-            posts_data.append(post_data)
-            processed_permalinks.add(permalink)
+        for i, (permalink, post) in enumerate(pending_posts.items(), 1):
+            # Top up the window with the next uncached posts
+            while len(fetches) < max_workers:
+                next_permalink = next(upcoming, None)
+                if next_permalink is None:
+                    break
+                if details_cache.get(next_permalink):
+                    continue  # Already cached; an empty entry is treated as missing and refetched
+                # Space out requests so a burst of fetches doesn't trip Reddit's rate limit
+                wait = last_request + request_interval - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                last_request = time.monotonic()
+                # Fetch detailed information about the post, including all comments
+                fetches[next_permalink] = executor.submit(miner.scrape_post_details, next_permalink)
             
-            # --- Save Progress Periodically ---
-            # This prevents data loss if the script is interrupted
-            if i % save_interval == 0:
-                save_to_file(posts_data, filename)
-                print(f"Saved progress: {len(posts_data)} posts")
+            try:
+                print(f"Processing post {i}/{len(pending_posts)}...")
+                fetched = permalink in fetches
+                if fetched:
+                    post_details = fetches.pop(permalink).result()
+                else:
+                    post_details = details_cache[permalink]
                 
-        except Exception as e:
-            # Handle any errors that occur while processing a specific post
-            print(f"Error processing post {i}: {e}")
-            # Save what we have so far to prevent total data loss
-            save_to_file(posts_data, filename)
-            print(f"Saved {len(posts_data)} posts to {filename} before error")
-            # Add a small delay to prevent hammering the server if something's wrong
-            time.sleep(1)
+                # --- Extract Relevant Post Information ---
+                comments = post_details.get("comments", [])
+                post_data = {
+                    "title": post.get("title", ""),  # Post title
+                    "body": post_details.get("body", ""),  # Post content/description
+                    "score": post.get("score", 0),  # Upvote score
+                    "url": post.get("url", ""),  # External URL (if any)
+                    "created_utc": post.get("created_utc", ""),  # Post creation timestamp
+                    "author": post.get("author", ""),  # Username of poster
+                    "permalink": permalink,  # Reddit permalink (for tracking and referencing)
+                    "all_comment_text": extract_all_comment_text(comments)  # All comments as one string
+                }
+                
+                # The nested comment tree repeats all_comment_text and isn't used by the
+                # analysis, so it's only saved when asked for (it stays in the details cache)
+                if keep_comment_tree:
+                    post_data["comments"] = comments  # Full comment data structure
+                
+                # Remember the raw details for next time, but only once they've been used
+                # successfully: YARS returns None for a failed fetch, which must be retried
+                # on the next run rather than cached
+                if fetched and isinstance(post_details, dict) and post_details:
+                    details_cache[permalink] = post_details
+                
+                # Add this post to our collection and mark it as processed
+                posts_data.append(post_data)
+                processed_permalinks.add(permalink)
+                
+                # --- Save Progress Periodically ---
+                # This prevents data loss if the script is interrupted
+                if i % save_interval == 0:
+                    save_to_file(posts_data, filename)
+                    details_cache.sync()
+                    print(f"Saved progress: {len(posts_data)} posts")
+                    
+            except Exception as e:
+                # Handle any errors that occur while processing a specific post
+                print(f"Error processing post {i}: {e}")
+                # Save what we have so far to prevent total data loss
+                save_to_file(posts_data, filename)
+                print(f"Saved {len(posts_data)} posts to {filename} before error")
+                # Add a small delay to prevent hammering the server if something's wrong
+                time.sleep(1)
     
     # --- Final Save ---
     save_to_file(posts_data, filename)
     print(f"Successfully saved {len(posts_data)} posts to {filename}")
     
-def save_to_file(data, filename):
+def load_from_file(filename):
+    """
+    Helper function to load data from a JSON file.
+    
+    Parameters:
+    - filename: Name of the file to load
+    
+    Returns:
+    - The decoded data (typically a list of post dictionaries)
+    """
+    if orjson is not None:
+        with open(filename, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_to_file(data, filename, pretty=False):
     """
     Helper function to save data to a JSON file.
     
     Parameters:
     - data: The data to save (typically a list of post dictionaries)
     - filename: Name of the file to save to
+    - pretty: Indent the JSON so it's easier to read by hand (default False, which
+      writes compact JSON that is smaller and faster to save and load)
     """
-    # Write the data as formatted JSON
-    # ensure_ascii=False allows for proper saving of non-ASCII characters (like emojis)
-    # indent=2 creates a nicely formatted, human-readable JSON file
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Write the data as JSON
+    # Non-ASCII characters (like emojis) are saved as-is rather than escaped
+    # The files are only read back by the scripts, so indentation is left out unless asked for
+    if orjson is not None:
+        # orjson always writes UTF-8; OPT_NON_STR_KEYS accepts the same keys json.dump does
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            if pretty:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            else:
+                json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
 
 # Only execute the following code if this script is run directly (not imported)
 if __name__ == "__main__":